@@ -6,14 +6,11 @@ import json
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-import urllib.request
-import urllib.error
 import psutil
 import hashlib
+import signal
 import time
 import httpx
-import subprocess
-import sys
 
 from nx0mesh_sdk import NX0Mesh
 
@@ -21,6 +18,11 @@ from nx0mesh_sdk import NX0Mesh
 ZONE = os.getenv("NX0_ZONE", "Unknown")
 NAME = os.getenv("NX0_NAME", "Unknown")
 PORT = 8080
+HEARTBEAT_LOG_INTERVAL = 60 # Seconds between CPU/RAM log lines (checks still run every 10s)
+
+# WebSocket Fan-out Limits
+BROADCAST_TIMEOUT = 5.0
+BROADCAST_MAX_CONCURRENCY = 100
 
 logging.basicConfig(
     level=logging.INFO,
@@ -43,10 +45,14 @@ app.add_middleware(
 # Initialize NEXUS-0 Mesh
 mesh = NX0Mesh(NAME, ZONE, PORT)
 
-# Sub-process Tracking
+# Simulated Node Tracking (in-process NX0Mesh instances)
 sub_processes = {}
 node_cache = []
+node_cache_by_name = {}
 cache_lock = asyncio.Lock()
+
+# Shared keep-alive client for peer /message delivery
+http_client = httpx.AsyncClient(timeout=5.0, limits=httpx.Limits(max_keepalive_connections=32))
 SALT = os.getenv("NX0_SALT", "SOVEREIGN-DEFAULT")
 
 def hash_id(value: str) -> str:
@@ -56,18 +62,28 @@ def hash_id(value: str) -> str:
 RIG_HASH = hash_id("Rig-Hub")
 MULE_HASH = hash_id("Data-Mule")
 
+def splice_json(message: dict, key: str, raw_value: str) -> str:
+    """Encode `message` with one extra member whose value is already-encoded JSON.
+
+    Safe because json.dumps of a non-empty dict always ends in '}' (dropped and re-added
+    after the new member), and `raw_value` is a complete JSON document produced by the SDK.
+    """
+    encoded = json.dumps(message)
+    return f'{encoded[:-1]}, {json.dumps(key)}: {raw_value}}}'
+
 async def discovery_loop():
     """Background task to refresh NEXUS-0 nodes."""
-    global node_cache
+    global node_cache, node_cache_by_name
     logger.info("Starting NEXUS-0 discovery loop")
     
     while True:
         try:
-            loop = asyncio.get_event_loop()
-            nodes = await loop.run_in_executor(None, mesh.discover)
+            nodes = mesh.discover()
+            node_index = {n.name: n for n in nodes}
 
             async with cache_lock:
                 node_cache = nodes
+                node_cache_by_name = node_index
                 anchor_status = "(Anchor)" if mesh._is_anchor else f"(Peering to {mesh._anchor_id})"
                 logger.info(f"📍 MESH: {len(node_cache)} nodes | My State: {anchor_status}")
             
@@ -91,13 +107,13 @@ async def discovery_loop():
                         "status": "Transferred"
                     })
                 
-            await manager.broadcast({
+            # Splice the SDK's cached node JSON in as-is instead of re-encoding every node
+            await manager.broadcast(splice_json({
                 "type": "mesh_update",
-                "nodes": [n.__dict__ for n in nodes],
                 "anchor_id": mesh._anchor_id,
                 "is_anchor": mesh._is_anchor,
                 "epoch_ts": mesh._last_epoch_ts
-            })
+            }, "nodes", mesh.nodes_snapshot_bytes().decode("utf-8")))
         except Exception as e:
             logger.error(f"Discovery loop error: {e}")
         
@@ -128,11 +144,16 @@ async def health():
 
 async def id_loop():
     """NEXUS-0 Survival Instincts."""
+    last_log_ts = 0
     while True:
         try:
-            cpu_usage = psutil.cpu_percent(interval=1)
+            # Non-blocking (measures since the previous call): this event loop is shared with every in-process node
+            cpu_usage = psutil.cpu_percent(interval=None)
             mem_usage = psutil.virtual_memory().percent
-            logger.info(f"Heartbeat: CPU {cpu_usage}% | RAM {mem_usage}%")
+            now = time.monotonic()
+            if now - last_log_ts >= HEARTBEAT_LOG_INTERVAL:
+                logger.info(f"Heartbeat: CPU {cpu_usage}% | RAM {mem_usage}%")
+                last_log_ts = now
             
             if mem_usage > 90:
                 mesh.status = "STRESSED"
@@ -154,7 +175,7 @@ async def startup_event():
     mesh.type = os.getenv("NX0_TYPE", "Bridge")
     mesh.ego_score = int(os.getenv("NX0_EGO", 0))
     
-    mesh.register()
+    await mesh.register()
     asyncio.create_task(discovery_loop())
     asyncio.create_task(id_loop())
 
@@ -167,55 +188,74 @@ async def startup_event():
         # Start from 50 (Alpha=100, others cascade)
         for i, name in enumerate(node_names):
             # Alpha is Anchor (100), others descending
-            # We use distinct UDP ports to avoid multicast loopback collision in Cloud Run env
             ego = 100 if name == "Alpha" else (90 - (i * 5))
-            spawn_node(name, "Agent", str(ego), base_port=19541 + i)
-            time.sleep(0.5)
+            await spawn_node_inproc(name, "Agent", str(ego))
 
     # ORCHESTRATION: If this is the main dashboard, spawn the mesh
     if mesh.type == "Bridge":
         logger.info("ORCHESTRATOR: Spawning simulated mesh nodes...")
-        spawn_node("Alpha", "Rig-Hub", "100")
-        spawn_node("Beta", "Rig-Hub", "90")
-        spawn_node("Gamma", "Data-Mule", "50")
-
-def spawn_node(name, ntype, ego, base_port=19541):
-    """Spawn an independent NEXUS-0 node as a sub-process."""
-    env = os.environ.copy()
-    env["NX0_NAME"] = name
-    env["NX0_TYPE"] = ntype
-    env["NX0_EGO"] = ego
-    env["NX0_PORT"] = str(base_port)
-    env["NX0_SIMULATION_MODE"] = "1"
-    # Allow sub-processes to inherit stdout/stderr for Cloud Run logging (Avoids pipe deadlock)
-    proc = subprocess.Popen(
-        [sys.executable, "bridge_server.py"],
-        env=env
-    )
-    sub_processes[name] = proc
-    logger.info(f"SPAWNED: {name} (PID: {proc.pid}) at Port {base_port}")
+        await spawn_node_inproc("Alpha", "Rig-Hub", "100")
+        await spawn_node_inproc("Beta", "Rig-Hub", "90")
+        await spawn_node_inproc("Gamma", "Data-Mule", "50")
+
+async def spawn_node_inproc(name, ntype, ego, port=PORT):
+    """Run an independent NEXUS-0 node on this event loop, relaying its pulses via the bridge mesh."""
+    previous = sub_processes.pop(name, None)
+    if previous is not None:
+        previous.close()
+
+    node = NX0Mesh(name, ZONE, port, node_type=ntype, ego_score=int(ego), relay=mesh)
+    await node.register()
+    sub_processes[name] = node
+    logger.info(f"SPAWNED: {name} (in-process) at Port {port}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    for node in sub_processes.values():
+        node.close()
+    sub_processes.clear()
     mesh.close()
+    await http_client.aclose()
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: list[WebSocket] = []
+        self._send_limit = asyncio.Semaphore(BROADCAST_MAX_CONCURRENCY)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+
+    async def broadcast(self, message: dict | str):
+        """Fan out to all clients concurrently; a slow socket no longer stalls the rest."""
+        # Encode once (pre-encoded str passes through), share the same text frame across every client
+        payload = message if isinstance(message, str) else json.dumps(message, default=str)
+
+        async def safe_send(ws: WebSocket):
+            async with self._send_limit:
+                try:
+                    await asyncio.wait_for(ws.send_text(payload), timeout=BROADCAST_TIMEOUT)
+                    return
+                except (WebSocketDisconnect, Exception):
+                    pass
+
+                self.disconnect(ws)
+                # A timed-out send may have left a half-written frame; close so the client reconnects.
+                # Closes run here, concurrently and bounded, so one stuck peer can't stall the fan-out.
+                try:
+                    await asyncio.wait_for(ws.close(), timeout=BROADCAST_TIMEOUT)
+                except Exception:
+                    pass
+
+        # Snapshot: connections may join/leave while sends are in flight
+        await asyncio.gather(
+            *[safe_send(ws) for ws in list(self.active_connections)],
+            return_exceptions=True
+        )
 
 manager = ConnectionManager()
 
@@ -237,18 +277,14 @@ async def websocket_endpoint(websocket: WebSocket):
             elif action == "send":
                 target_name = data.get("target")
                 content = data.get("content")
-                async with cache_lock:
-                    target_node = next((n for n in node_cache if n.name == target_name), None)
+                # O(1) lookup; the index is swapped wholesale, so no lock is needed to read it
+                target_node = node_cache_by_name.get(target_name)
                 
                 if target_node:
                     try:
                         url = f"http://{target_node.address}/message"
-                        req = urllib.request.Request(
-                            url, 
-                            data=json.dumps({"sender": NAME, "content": content}).encode('utf-8'),
-                            headers={'Content-Type': 'application/json'}
-                        )
-                        urllib.request.urlopen(req)
+                        r = await http_client.post(url, json={"sender": NAME, "content": content})
+                        r.raise_for_status()
                         await websocket.send_json({"type": "status", "msg": f"Sent to {target_name}"})
                     except Exception as e:
                         await websocket.send_json({"type": "error", "msg": str(e)})
@@ -270,7 +306,7 @@ async def kill_node():
 
 @app.get("/nodes")
 async def list_nodes():
-    """Diagnostic: List all currently tracked sub-processes."""
+    """Diagnostic: List all currently tracked simulated nodes."""
     return {
         "tracked": list(sub_processes.keys()),
         "count": len(sub_processes),
@@ -290,8 +326,8 @@ async def node_status():
 
 @app.post("/kill")
 async def remote_kill(target: str):
-    """Orchestrate a kill signal for a sub-process."""
-    logger.warning(f"ORCHESTRATOR: Terminating sub-process '{target}'")
+    """Orchestrate a kill signal for a simulated node."""
+    logger.warning(f"ORCHESTRATOR: Terminating simulated node '{target}'")
     
     # Standardize: remove prefix, handle lowercase/uppercase
     clean_target = target.replace("nx0-", "").lower()
@@ -300,14 +336,14 @@ async def remote_kill(target: str):
     name = next((k for k in sub_processes.keys() if k.lower() == clean_target), None)
     
     if name and name in sub_processes:
-        proc = sub_processes[name]
-        logger.info(f"ORCHESTRATOR: Found match '{name}' for target '{target}'. Terminating PID {proc.pid}")
-        proc.terminate()
+        node = sub_processes[name]
+        logger.info(f"ORCHESTRATOR: Found match '{name}' for target '{target}'. Closing node {node.name}")
+        node.close()
         del sub_processes[name]
         return {"status": "success", "msg": f"Terminated {name}"}
     
     logger.error(f"ORCHESTRATOR: Target '{target}' (mapped to '{clean_target}') not found in tracked nodes: {list(sub_processes.keys())}")
-    return {"status": "error", "msg": f"Target {target} not found in sub-processes. Tracked: {list(sub_processes.keys())}"}
+    return {"status": "error", "msg": f"Target {target} not found in simulated nodes. Tracked: {list(sub_processes.keys())}"}
 
 @app.post("/message")
 async def receive_message(msg: dict):
@@ -333,13 +369,19 @@ if __name__ == "__main__":
         logger.info(f"SIMULATION: Starting {NAME} in SDK-Only mode.")
         mesh.type = os.getenv("NX0_TYPE", "Agent")
         mesh.ego_score = int(os.getenv("NX0_EGO", 0))
-        mesh.register()
         
         async def run_forever():
-            # Dummy loop to keep the process alive and responding to UDP pulses
-            # The NX0Mesh background thread handles the pulses.
-            while True:
-                await asyncio.sleep(60)
+            # Park until SIGTERM/SIGINT; the NX0Mesh datagram endpoint and pulse task run on this loop.
+            stop_event = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, stop_event.set)
+
+            await mesh.register()
+            try:
+                await stop_event.wait()
+            finally:
+                mesh.close()
         
         try:
             asyncio.run(run_forever())
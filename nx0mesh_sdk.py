@@ -2,24 +2,50 @@ import time
 import socket
 import logging
 import json
-import threading
+import asyncio
 import psutil
 import hashlib
 import hmac
 import re
 import os
 import struct
-from dataclasses import dataclass, field
+import base64
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
 from typing import List, Optional, Dict, Set
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 
+try:
+    import orjson
+except ImportError:  # Stdlib fallback (slower, same wire bytes)
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("nx0mesh")
 
 # NEXUS-0 Multicast (NMC) Configuration
 NMC_GROUP = "ff02::1"
 NMC_PORT = 19541 # Sovereign Port
+PUBKEY_CACHE_SIZE = 1024 # Parsed peer keys kept (LRU)
+ANCHOR_TIMEOUT = 15.0 # Anchor silence (s) before failover evaluation
+FAILOVER_HYSTERESIS = 5.0 # Confirmation buffer (s) before self-promotion
+ALERT_INTERVAL = 30.0 # Min seconds between repeated SECURITY ALERTs for the same peer
+ANN_BATCH_MAX = 16 # Upper bound on items accepted from one ANN_BATCH datagram
+ANN_BATCH_MAX_BYTES = 1400 # Keep each ANN_BATCH under the link MTU (no IPv6 fragmentation)
+_ANN_BATCH_HEAD = b'{"type":"ANN_BATCH","items":['
+_ANN_BATCH_TAIL = b']}'
+
+def _dumps(obj, sort_keys: bool = False) -> bytes:
+    """Compact JSON encoding to bytes (orjson when available, stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
 
 @dataclass
 class NX0Node:
@@ -34,8 +60,21 @@ class NX0Node:
     signature: str = "UNSIGNED" 
     status: str = "HEALTHY"
 
+class NX0Protocol(asyncio.DatagramProtocol):
+    """Event-loop receiver for NMC pulses (replaces the blocking listener thread)."""
+    def __init__(self, mesh: "NX0Mesh"):
+        self.mesh = mesh
+
+    def datagram_received(self, data: bytes, addr):
+        self.mesh._dispatch(data, addr[0])
+
+    def error_received(self, exc):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Listen Error: {exc}")
+
 class NX0Mesh:
-    def __init__(self, name: str, zone: str = "NEXUS-0", port: int = 8080, node_type: str = "Bridge", ego_score: int = 100):
+    def __init__(self, name: str, zone: str = "NEXUS-0", port: int = 8080, node_type: str = "Bridge", ego_score: int = 100,
+                 relay: Optional["NX0Mesh"] = None):
         self.name = name
         self.zone = zone
         self.port = port
@@ -45,19 +84,30 @@ class NX0Mesh:
         self.status = "HEALTHY"
         
         self.nodes = {} 
+        self._verified_core: Dict[str, str] = {} # name_hash -> payload_b64 last verified against its signature
+        self._nodes_json = b"[]"
+        self._nodes_json_dirty = True
+
+        # ANN Batching: co-located nodes hand their pulses to a relay that multicasts them together
+        self._relay = relay
+        self._ann_queue: Dict[str, bytes] = {} # Latest encoded pulse per sender pubkey
         self._shunned = set() 
         self._pulse_cache = {} 
+        self._pubkey_cache: "OrderedDict[str, ed25519.Ed25519PublicKey]" = OrderedDict()
         self._salt = os.getenv("NX0_SALT", "SOVEREIGN-DEFAULT")
+        self._hash_cache: Dict[str, str] = {} # Salt is per-instance, so key by value only
         
         # Security Anchor & Failover State
         self._is_anchor = False
         self._anchor_id = None 
         self._anchor_pubkey = None
-        self._epoch_key = os.urandom(32) # Fallback key
-        self._last_epoch_ts = 0
-        self._last_anchor_pulse_ts = 0
-        self._last_epoch_response_ts = 0 # Rate-limiting
-        self._failover_hysteresis_ts = 0 # Confirmation buffer
+        self._set_epoch_key(os.urandom(32)) # Fallback key
+        self._last_epoch_ts = 0 # Wall clock (serialized in EPOCH)
+        self._last_epoch_response_ts = 0 # Monotonic; Rate-limiting
+        self._failover_hysteresis_ts = 0 # Monotonic; Confirmation buffer
+        self._last_alert_peer = None # Receive-path logging: alert on transitions, then rate-limited
+        self._last_alert_ts = 0 # Monotonic
+        self._anchor_watchdog: Optional[asyncio.TimerHandle] = None
         
         # Sovereign Identity (Volatile Session Key)
         self._private_key = ed25519.Ed25519PrivateKey.generate()
@@ -67,9 +117,19 @@ class NX0Mesh:
         )
         self.pubkey_hex = self.public_key_bytes.hex()
         
+        # Signed ANN Cache (Identity core is re-signed only on change)
+        self._cached_core_key = None
+        self._cached_core_b64 = None
+        self._cached_core_raw = b""
+        self._cached_core_sig = None
+        self._cached_core_hmac = None
+        self._cached_hmac_key = None
+
         self._running = False
-        self._listen_thread = None
-        self._adv_thread = None
+        self._transport = None
+        self._adv_task = None
+        self._send_sock = None
+        self._loop = None
         
         # Network Identity
         self.ipv6_ll, self.interface = self._get_ipv6_ll()
@@ -90,15 +150,28 @@ class NX0Mesh:
             logger.error(f"IP Detect Error: {e}")
         return None, None
 
+    def _set_epoch_key(self, key: bytes):
+        """Adopt an Epoch Key and precompute its keyed HMAC state; verifiers .copy() it per packet."""
+        self._epoch_key = key
+        self._hmac_template = hmac.new(key, b"", hashlib.sha256)
+
     def _hash_id(self, value: str) -> str:
-        return hashlib.sha256(f"{value}:{self._salt}".encode()).hexdigest()[:16]
+        digest = self._hash_cache.get(value)
+        if digest is None:
+            digest = hashlib.sha256(f"{value}:{self._salt}".encode()).hexdigest()[:16]
+            self._hash_cache[value] = digest
+        return digest
 
-    def register(self):
+    async def register(self):
         self._running = True
-        self._listen_thread = threading.Thread(target=self._listen_for_peers, daemon=True)
-        self._adv_thread = threading.Thread(target=self._advertise_presence, daemon=True)
-        self._listen_thread.start()
-        self._adv_thread.start()
+        self._loop = asyncio.get_running_loop()
+        # One persistent send socket for every outbound pulse (ANN, EPOCH, REQ_EPOCH)
+        self._send_sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+        self._send_sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_HOPS, 1)
+        await self._listen_for_peers()
+        self._adv_task = asyncio.create_task(self._advertise_presence())
+        # No Anchor known yet: evaluate on the first loop turn, as before the first pulse
+        self._arm_anchor_watchdog(0)
         
         # Immediate Sync: Demand the truth from the Anchor
         self._request_epoch()
@@ -106,7 +179,6 @@ class NX0Mesh:
 
     def _request_epoch(self):
         """Broadcast a demand for immediate truth synchronization."""
-        sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
         msg = {
             "type": "REQ_EPOCH",
             "requester": self.name,
@@ -114,10 +186,10 @@ class NX0Mesh:
             "ts": time.time()
         }
         # Sign it
-        raw_req = json.dumps(msg, sort_keys=True).encode('utf-8')
-        msg["signature"] = self._private_key.sign(raw_req).hex()
+        raw_req = _dumps(msg, sort_keys=True)
+        msg["signature"] = base64.b64encode(self._private_key.sign(raw_req)).decode('ascii')
         
-        sock.sendto(json.dumps(msg).encode('utf-8'), (NMC_GROUP, NMC_PORT))
+        self._send_sock.sendto(_dumps(msg), (NMC_GROUP, NMC_PORT))
         logger.debug("Sent REQ_EPOCH pulse.")
 
     def stop(self):
@@ -125,75 +197,165 @@ class NX0Mesh:
         self._running = False
         logger.info(f"Shutting down node: {self.name}")
 
-    def _advertise_presence(self):
-        sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_HOPS, 1)
-        
+    async def _advertise_presence(self):
         while self._running:
             try:
-                # 1. Deterministic Failover Check
-                # If the Anchor is silent for 15s, evaluate promotion
-                if not self._is_anchor and (time.time() - self._last_anchor_pulse_ts > 15):
-                    self._evaluate_failover()
-
-                # 2. Anchor: Scheduled Epoch Broadcast (60s)
-                if self._is_anchor and (time.time() - self._last_epoch_ts > 60):
-                    self._broadcast_epoch(sock)
-
-                # 3. Standard Pulse (ANN)
-                node_data = {
-                    "name_hash": self._hash_id(self.name),
-                    "type_hash": self._hash_id(self.type),
-                    "zone": self.zone,
-                    "address": f"[{self.ipv6_ll}]:{self.port}",
-                    "ego_score": self.ego_score,
-                    "uptime": time.time() - self.start_time,
-                    "pubkey": self.pubkey_hex,
-                    "status": self.status
-                }
-                
+                # One consistent wall clock per tick (Failover is driven by the Anchor watchdog)
+                wall = time.time()
+
+                # 1. Anchor: Scheduled Epoch Broadcast (60s)
+                if self._is_anchor and (wall - self._last_epoch_ts > 60):
+                    self._broadcast_epoch()
+
+                # 2. Standard Pulse (ANN)
+                payload_b64, sig, mac = self._signed_identity_core()
+
                 msg = {
                     "type": "ANN",
-                    "node": node_data,
-                    "ts": time.time()
+                    # Signed core travels as opaque bytes: receivers verify without re-encoding
+                    "payload_b64": payload_b64,
+                    # Liveness rides outside the signed core (changes every pulse)
+                    "live": {"uptime": wall - self.start_time},
+                    "ts": wall,
+                    "signature": sig,
+                    "hmac": mac
                 }
-                
-                # Sign with Ed25519
-                raw_data = json.dumps(node_data, sort_keys=True).encode('utf-8')
-                msg["signature"] = self._private_key.sign(raw_data).hex()
-                
-                # Add Integrity HMAC (If Epoch is known)
-                msg["hmac"] = hmac.new(self._epoch_key, raw_data, hashlib.sha256).hexdigest()
-                
-                sock.sendto(json.dumps(msg).encode('utf-8'), (NMC_GROUP, NMC_PORT))
+
+                frame = _dumps(msg)
+                if self._relay is not None and self._relay._running:
+                    self._relay.queue_announcement(self.pubkey_hex, frame)
+                else:
+                    self._send_announcements(frame)
             except Exception as e:
                 logger.debug(f"ADV Error: {e}")
-            time.sleep(5)
+            await asyncio.sleep(5)
+
+    def queue_announcement(self, sender_key: str, frame: bytes):
+        """Relay Only: hold a co-located node's encoded ANN for the next batched pulse."""
+        self._ann_queue[sender_key] = frame
+
+    def _send_announcements(self, own_frame: bytes):
+        """Multicast our ANN, folding any relayed pulses into ANN_BATCH frames."""
+        if not self._ann_queue:
+            self._send_sock.sendto(own_frame, (NMC_GROUP, NMC_PORT))
+            return
+
+        frames = list(self._ann_queue.values())
+        frames.append(own_frame)
+        self._ann_queue = {}
+
+        # Pack by byte budget: a lost fragment would otherwise drop every announcement in the batch
+        overhead = len(_ANN_BATCH_HEAD) + len(_ANN_BATCH_TAIL)
+        batch, size = [], overhead
+        for frame in frames:
+            cost = len(frame) + (1 if batch else 0) # "," separator
+            if batch and (size + cost > ANN_BATCH_MAX_BYTES or len(batch) == ANN_BATCH_MAX):
+                self._send_batch(batch)
+                batch, size, cost = [], overhead, len(frame)
+            batch.append(frame)
+            size += cost
+        if batch:
+            self._send_batch(batch)
+
+    def _send_batch(self, frames: List[bytes]):
+        """Emit one ANN_BATCH datagram from already-encoded frames without re-encoding them."""
+        if len(frames) == 1:
+            self._send_sock.sendto(frames[0], (NMC_GROUP, NMC_PORT))
+            return
+
+        iov = [_ANN_BATCH_HEAD]
+        for i, frame in enumerate(frames):
+            if i:
+                iov.append(b",")
+            iov.append(frame)
+        iov.append(_ANN_BATCH_TAIL)
+
+        if hasattr(self._send_sock, "sendmsg"):
+            # Scatter-gather: the kernel assembles the datagram, one syscall, no joined copy
+            self._send_sock.sendmsg(iov, [], 0, (NMC_GROUP, NMC_PORT))
+        else:
+            self._send_sock.sendto(b"".join(iov), (NMC_GROUP, NMC_PORT))
+
+    def _signed_identity_core(self):
+        """Return (payload_b64, signature, hmac), re-signing only when the identity core changes."""
+        core_key = (self.name, self.type, self.zone, self.ipv6_ll, self.port, self.ego_score, self.status)
+        if core_key != self._cached_core_key:
+            # name/type may be reassigned after construction (bridge startup); lookups are memoized
+            node_data = {
+                "name_hash": self._hash_id(self.name),
+                "type_hash": self._hash_id(self.type),
+                "zone": self.zone,
+                "address": f"[{self.ipv6_ll}]:{self.port}",
+                "ego_score": self.ego_score,
+                "pubkey": self.pubkey_hex,
+                "status": self.status
+            }
+            self._cached_core_raw = _dumps(node_data, sort_keys=True)
+            self._cached_core_b64 = base64.b64encode(self._cached_core_raw).decode('ascii')
+            # Sign with Ed25519
+            self._cached_core_sig = base64.b64encode(self._private_key.sign(self._cached_core_raw)).decode('ascii')
+            self._cached_core_key = core_key
+            self._cached_hmac_key = None
+
+        # Integrity HMAC: recomputed only when the Epoch Key rotates or the core changes
+        if self._cached_hmac_key is not self._epoch_key:
+            h = self._hmac_template.copy()
+            h.update(self._cached_core_raw)
+            self._cached_core_hmac = h.hexdigest()
+            self._cached_hmac_key = self._epoch_key
+
+        return self._cached_core_b64, self._cached_core_sig, self._cached_core_hmac
 
-    def _evaluate_failover(self):
+    def _arm_anchor_watchdog(self, delay: float):
+        if self._anchor_watchdog is not None:
+            self._anchor_watchdog.cancel()
+        self._anchor_watchdog = self._loop.call_later(delay, self._on_anchor_silence)
+
+    def _reset_anchor_watchdog(self):
+        """A valid Anchor pulse arrived: push the silence deadline out by ANCHOR_TIMEOUT."""
+        self._failover_hysteresis_ts = 0
+        if self._loop is not None:
+            self._arm_anchor_watchdog(ANCHOR_TIMEOUT)
+
+    def _on_anchor_silence(self):
+        """Deterministic Failover Check: fires only once the Anchor has been silent for ANCHOR_TIMEOUT."""
+        self._anchor_watchdog = None
+        if not self._running or self._is_anchor:
+            return
+
+        self._evaluate_failover(self._loop.time())
+        if not self._is_anchor:
+            # Re-check after the hysteresis buffer (or another timeout) until promoted or the Anchor returns
+            self._arm_anchor_watchdog(FAILOVER_HYSTERESIS if self._failover_hysteresis_ts else ANCHOR_TIMEOUT)
+
+    def _evaluate_failover(self, now: float):
         """Autonomous Promotion: Highest Ego/Seniority node becomes Anchor."""
-        peers = list(self.nodes.values())
-        if not peers:
+        if not self.nodes:
             if not self._is_anchor:
                 self._is_anchor = True
                 logger.info("GENESIS: I am the only node. Assuming Anchor status.")
             return
 
         # Selection formula: Max(Ego, FirstSeen, ID)
-        top_ego = max([p.ego_score for p in peers] + [self.ego_score])
+        # Local Peer Aging: Use local 'first_seen' for seniority
+        # My own 'first seen' is my start_time
+        my_seniority = self.start_time
+        top_ego = self.ego_score
+        top_seniority = my_seniority
+        for p in self.nodes.values():
+            if p.ego_score > top_ego:
+                top_ego = p.ego_score
+            if p.first_seen_ts < top_seniority:
+                top_seniority = p.first_seen_ts
+
         if self.ego_score >= top_ego:
-            # Local Peer Aging: Use local 'first_seen' for seniority
-            # My own 'first seen' is my start_time
-            my_seniority = self.start_time
-            top_seniority = min([p.first_seen_ts for p in peers] + [my_seniority])
-            
             if my_seniority <= top_seniority:
                 # Hysteresis: Require silence + 5s buffer to prevent Promotion Storms
                 if self._failover_hysteresis_ts == 0:
-                    self._failover_hysteresis_ts = time.time()
+                    self._failover_hysteresis_ts = now
                     logger.info("FAILOVER: Anchor silent. Initiating hysteresis buffer...")
                 
-                if time.time() - self._failover_hysteresis_ts > 5:
+                if now - self._failover_hysteresis_ts >= FAILOVER_HYSTERESIS:
                     self._is_anchor = True
                     logger.warning("FAILOVER: Succession confirmed. I am promoting myself.")
                     self._last_epoch_ts = 0 
@@ -201,13 +363,10 @@ class NX0Mesh:
         else:
             self._failover_hysteresis_ts = 0
 
-    def _broadcast_epoch(self, sock=None):
+    def _broadcast_epoch(self):
         """Anchor Only: Broadcast Truth pulse."""
-        if sock is None:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
-            
         new_key = os.urandom(32)
-        self._epoch_key = new_key
+        self._set_epoch_key(new_key)
         self._last_epoch_ts = time.time()
         
         epoch_msg = {
@@ -219,15 +378,21 @@ class NX0Mesh:
             "ts": self._last_epoch_ts
         }
         
-        raw_epoch = json.dumps(epoch_msg, sort_keys=True).encode('utf-8')
-        epoch_msg["signature"] = self._private_key.sign(raw_epoch).hex()
+        raw_epoch = _dumps(epoch_msg, sort_keys=True)
+        wire_msg = {
+            "type": "EPOCH",
+            "payload_b64": base64.b64encode(raw_epoch).decode('ascii'),
+            "signature": base64.b64encode(self._private_key.sign(raw_epoch)).decode('ascii')
+        }
         
-        sock.sendto(json.dumps(epoch_msg).encode('utf-8'), (NMC_GROUP, NMC_PORT))
+        self._send_sock.sendto(_dumps(wire_msg), (NMC_GROUP, NMC_PORT))
         logger.info(f"ANCHOR: Broadasting New Epoch Key (TS: {epoch_msg['ts']})")
 
-    def _listen_for_peers(self):
+    async def _listen_for_peers(self):
+        """Bind the NMC group on the running event loop; pulses arrive via NX0Protocol."""
         sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setblocking(False)
         sock.bind(('::', NMC_PORT))
         
         if self.interface:
@@ -238,101 +403,150 @@ class NX0Mesh:
             except Exception as e:
                 logger.error(f"Group Join Error: {e}")
 
-        while self._running:
-            try:
-                data, addr = sock.recvfrom(8192)
-                peer_id = addr[0]
-                
-                msg = json.loads(data.decode('utf-8'))
-                m_type = msg.get("type")
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: NX0Protocol(self), sock=sock)
 
-                if m_type == "EPOCH":
-                    self._handle_epoch(msg, peer_id)
-                elif m_type == "ANN":
-                    self._handle_announcement(msg, peer_id)
-                elif m_type == "REQ_EPOCH":
-                    self._handle_epoch_request(msg, peer_id)
+    def _dispatch(self, data: bytes, peer_id: str):
+        try:
+            msg = _loads(data)
+            m_type = msg.get("type")
 
-            except Exception as e:
+            if m_type == "EPOCH":
+                self._handle_epoch(msg, peer_id)
+            elif m_type == "ANN":
+                self._handle_announcement(msg, peer_id)
+            elif m_type == "ANN_BATCH":
+                for item in msg.get("items", [])[:ANN_BATCH_MAX]:
+                    try:
+                        self._handle_announcement(item, peer_id)
+                    except Exception as e:
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Listen Error: {e}")
+            elif m_type == "REQ_EPOCH":
+                self._handle_epoch_request(msg, peer_id)
+
+        except Exception as e:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Listen Error: {e}")
 
+    def _load_pubkey(self, pubkey_hex: str) -> ed25519.Ed25519PublicKey:
+        """Parse a peer's Ed25519 key once, then serve it from the LRU cache."""
+        pubkey = self._pubkey_cache.get(pubkey_hex)
+        if pubkey is not None:
+            self._pubkey_cache.move_to_end(pubkey_hex)
+            return pubkey
+
+        pubkey = ed25519.Ed25519PublicKey.from_public_bytes(bytes.fromhex(pubkey_hex))
+        self._pubkey_cache[pubkey_hex] = pubkey
+        if len(self._pubkey_cache) > PUBKEY_CACHE_SIZE:
+            self._pubkey_cache.popitem(last=False)
+        return pubkey
+
     def _handle_epoch_request(self, msg, peer_id):
         """Sentient Defense: Respond to rapid sync requests if I am Anchor."""
         if self._is_anchor:
             # Rate-limiting: Max 1 response per 2 seconds (Anti-DDoS)
-            if time.time() - self._last_epoch_response_ts < 2:
+            now = time.monotonic()
+            if now - self._last_epoch_response_ts < 2:
                 return 
                 
-            logger.info(f"ANCHOR: Received REQ_EPOCH from {peer_id}. Responding.")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"ANCHOR: Received REQ_EPOCH from {peer_id}. Responding.")
             self._broadcast_epoch()
-            self._last_epoch_response_ts = time.time()
+            self._last_epoch_response_ts = now
 
     def _handle_epoch(self, msg, peer_id):
         """Validate and adopt a new Anchor Truth."""
-        peer_ego = msg.get("ego", 0)
-        peer_pubkey = msg.get("anchor_pubkey")
         sig = msg.get("signature")
+        raw_epoch = base64.b64decode(msg.get("payload_b64", ""))
+        epoch = _loads(raw_epoch)
+        peer_ego = epoch.get("ego", 0)
+        peer_pubkey = epoch.get("anchor_pubkey")
         
         # 1. Selection logic: Only accept if they have higher or equal authority
         if peer_ego < self.ego_score:
             return 
 
-        # 2. Cryptographic Validation
+        # 2. Cryptographic Validation (over the exact bytes that were signed)
         try:
-            pubkey = ed25519.Ed25519PublicKey.from_public_bytes(bytes.fromhex(peer_pubkey))
-            raw_msg = json.dumps({k: v for k, v in msg.items() if k != "signature"}, sort_keys=True).encode('utf-8')
-            pubkey.verify(bytes.fromhex(sig), raw_msg)
+            pubkey = self._load_pubkey(peer_pubkey)
+            pubkey.verify(base64.b64decode(sig), raw_epoch)
         except Exception as e:
-            logger.warning(f"SECURITY ALERT: Forged EPOCH from {peer_id}: {e}")
+            now = time.monotonic()
+            if self._last_alert_peer != peer_id or now - self._last_alert_ts >= ALERT_INTERVAL:
+                self._last_alert_peer = peer_id
+                self._last_alert_ts = now
+                logger.warning(f"SECURITY ALERT: Forged EPOCH from {peer_id}: {e}")
             return
 
         # 3. Adopt the truth
-        self._epoch_key = bytes.fromhex(msg["key_hex"])
+        anchor_changed = self._anchor_id != peer_id
+        self._last_alert_peer = None # Next forgery after a good EPOCH is reported immediately
+        self._set_epoch_key(bytes.fromhex(epoch["key_hex"]))
         self._anchor_id = peer_id
         self._anchor_pubkey = peer_pubkey
-        self._last_anchor_pulse_ts = time.time()
+        self._reset_anchor_watchdog()
         
         if peer_id != self.ipv6_ll:
             self._is_anchor = False
-            logger.info(f"TRUTH ADOPTED: Anchor confirmed at {peer_id}")
+            if anchor_changed:
+                logger.info(f"TRUTH ADOPTED: Anchor confirmed at {peer_id}")
         else:
             self._is_anchor = True
 
     def _handle_announcement(self, msg, peer_id):
-        node_data = msg.get("node")
+        payload_b64 = msg.get("payload_b64")
         sig = msg.get("signature")
         hmac_val = msg.get("hmac")
-        pubkey_hex = node_data.get("pubkey")
         
-        if not node_data or not sig:
+        if not payload_b64 or not sig:
             return # Silent Drop
+        raw_data = base64.b64decode(payload_b64)
 
         # 1. Deterministic Verification: HMAC (Noise Filter)
         if hmac_val:
-            raw_data = json.dumps(node_data, sort_keys=True).encode('utf-8')
-            expected_hmac = hmac.new(self._epoch_key, raw_data, hashlib.sha256).hexdigest()
+            h = self._hmac_template.copy()
+            h.update(raw_data)
+            expected_hmac = h.hexdigest()
             if not hmac.compare_digest(hmac_val, expected_hmac):
                 return # Silent Drop
 
-        # Update Last contact
-        if peer_id == self._anchor_id:
-            self._last_anchor_pulse_ts = time.time()
-
-        # 2. Cryptographic Verification: Ed25519 (Identity Filter)
         try:
-            pubkey = ed25519.Ed25519PublicKey.from_public_bytes(bytes.fromhex(pubkey_hex))
-            raw_data = json.dumps(node_data, sort_keys=True).encode('utf-8')
-            pubkey.verify(bytes.fromhex(sig), raw_data)
+            node_data = _loads(raw_data)
         except Exception:
             return # Silent Drop
+        name_hash = node_data.get("name_hash", peer_id)
+        pubkey_hex = node_data.get("pubkey")
+
+        # 2. Cryptographic Verification: Ed25519 (Identity Filter)
+        # The Epoch Key is shared mesh-wide, so HMAC alone cannot vouch for a peer's fields.
+        # Skip Ed25519 only when the exact signed bytes and signature were already verified
+        # (the signed core is byte-identical across steady-state pulses).
+        known = self.nodes.get(name_hash)
+        unchanged = (known is not None and known.signature == sig
+                     and self._verified_core.get(name_hash) == payload_b64)
+        if not unchanged:
+            try:
+                pubkey = self._load_pubkey(pubkey_hex)
+                pubkey.verify(base64.b64decode(sig), raw_data)
+            except Exception:
+                return # Silent Drop
+
+        # Update Last contact (only a verified pulse may hold off failover)
+        if peer_id == self._anchor_id:
+            self._reset_anchor_watchdog()
 
         # Peer is Verified
-        name_hash = node_data.get("name_hash", peer_id)
         if peer_id != self.ipv6_ll:
+            if unchanged:
+                # Liveness-only pulse: refresh in place, the cached snapshot stays valid
+                known.uptime = msg.get("live", {}).get("uptime", 0)
+                return
+
             # Local Peer Aging: Record when we FIRST saw this node
             first_seen = time.time()
-            if name_hash in self.nodes:
-                first_seen = self.nodes[name_hash].first_seen_ts
+            if known is not None:
+                first_seen = known.first_seen_ts
 
             self.nodes[name_hash] = NX0Node(
                 name=name_hash, 
@@ -340,15 +554,43 @@ class NX0Mesh:
                 zone=node_data.get("zone"),
                 address=node_data.get("address"),
                 ego_score=node_data.get("ego_score"),
-                uptime=node_data.get("uptime", 0),
+                uptime=msg.get("live", {}).get("uptime", 0),
                 first_seen_ts=first_seen,
                 signature=sig,
                 status=node_data.get("status")
             )
+            self._verified_core[name_hash] = payload_b64
+            self._nodes_json_dirty = True
 
     def discover(self, zone: str = "*") -> List[NX0Node]:
         return [n for n in self.nodes.values() if zone == "*" or n.zone == zone]
 
+    def nodes_snapshot_bytes(self) -> bytes:
+        """JSON array of all known nodes, re-encoded only when a node joins or its signed core changes.
+
+        Liveness (`uptime`) is refreshed in place without invalidating, so the snapshot's
+        uptime values are as of the last re-encode; use discover() for live values.
+        """
+        if self._nodes_json_dirty:
+            self._nodes_json = _dumps([asdict(n) for n in self.nodes.values()])
+            self._nodes_json_dirty = False
+        return self._nodes_json
+
     def close(self):
         self._running = False
+        if self._relay is not None:
+            # Don't let the relay multicast our last pulse after we're gone
+            self._relay._ann_queue.pop(self.pubkey_hex, None)
+        if self._adv_task is not None:
+            self._adv_task.cancel()
+            self._adv_task = None
+        if self._anchor_watchdog is not None:
+            self._anchor_watchdog.cancel()
+            self._anchor_watchdog = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._send_sock is not None:
+            self._send_sock.close()
+            self._send_sock = None
         logger.info("NEXUS-0 Node Shutting Down.")